@@ -20,6 +20,8 @@ class Config:
     grok_model: str
     group_config_path: str | None
     group_config_json: str | None
+    group_config_reload_interval: float
+    admin_token: str | None
     onebot_base_url: str
     onebot_access_token: str | None
     single_group_id: int
@@ -29,6 +31,12 @@ class Config:
     storage_path: str
     log_level: str
     port: int
+    event_deadline_seconds: float
+    shutdown_grace_seconds: float
+    response_cache_enabled: bool
+    response_cache_ttl: int
+    response_cache_max_entries: int
+    response_cache_context_turns: int
 
 
 def load_config() -> Config:
@@ -54,6 +62,14 @@ def load_config() -> Config:
     if not single_group_id:
         raise ValueError("SINGLE_GROUP_ID is required")
 
+    event_deadline_seconds = float(os.getenv("EVENT_DEADLINE_SECONDS", "60"))
+    # Default the drain to one full event budget plus slack for the final send,
+    # so an event in flight when SIGTERM arrives can still finish.
+    shutdown_grace = os.getenv("SHUTDOWN_GRACE_SECONDS")
+    shutdown_grace_seconds = (
+        float(shutdown_grace) if shutdown_grace else event_deadline_seconds + 5
+    )
+
     return Config(
         deepseek_api_key=deepseek_api_key,
         deepseek_base_url=os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com"),
@@ -64,6 +80,8 @@ def load_config() -> Config:
         grok_model=os.getenv("GROK_MODEL", "grok-2-latest"),
         group_config_path=os.getenv("GROUP_CONFIG_PATH"),
         group_config_json=os.getenv("GROUP_CONFIG_JSON"),
+        group_config_reload_interval=float(os.getenv("GROUP_CONFIG_RELOAD_INTERVAL", "5")),
+        admin_token=os.getenv("ADMIN_TOKEN"),
         onebot_base_url=onebot_base_url,
         onebot_access_token=os.getenv("ONEBOT_ACCESS_TOKEN"),
         single_group_id=int(single_group_id),
@@ -73,4 +91,10 @@ def load_config() -> Config:
         storage_path=os.getenv("STORAGE_PATH", "./data/state.json"),
         log_level=os.getenv("LOG_LEVEL", "INFO"),
         port=int(os.getenv("PORT", "8080")),
+        event_deadline_seconds=event_deadline_seconds,
+        shutdown_grace_seconds=shutdown_grace_seconds,
+        response_cache_enabled=_get_bool(os.getenv("RESPONSE_CACHE_ENABLED"), False),
+        response_cache_ttl=int(os.getenv("RESPONSE_CACHE_TTL", "600")),
+        response_cache_max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")),
+        response_cache_context_turns=int(os.getenv("RESPONSE_CACHE_CONTEXT_TURNS", "0")),
     )
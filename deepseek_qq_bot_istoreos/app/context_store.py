@@ -1,5 +1,7 @@
 import json
 import os
+import sys
+from collections import deque
 from dataclasses import dataclass
 from threading import Lock
 from typing import Any
@@ -8,6 +10,27 @@ from filelock import FileLock
 from .utils import clamp_message
 
 
+class _Message:
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: str, content: str) -> None:
+        self.role = role
+        self.content = content
+
+
+class _GroupHistory:
+    __slots__ = ("system", "messages")
+
+    def __init__(self, system: str | None, max_messages: int | None) -> None:
+        self.system = system
+        self.messages: deque[_Message] = deque(maxlen=max_messages)
+
+    def to_list(self) -> list[dict[str, str]]:
+        result = [{"role": "system", "content": self.system}] if self.system else []
+        result.extend({"role": m.role, "content": m.content} for m in self.messages)
+        return result
+
+
 @dataclass
 class ContextStore:
     storage_path: str
@@ -17,7 +40,8 @@ class ContextStore:
     def __post_init__(self) -> None:
         self._lock = FileLock(self.storage_path + ".lock")
         self._mem_lock = Lock()
-        self._groups: dict[str, list[dict[str, str]]] = {}
+        self._groups: dict[str, _GroupHistory] = {}
+        self._closed = False
         self._ensure_dir()
         self._load()
 
@@ -37,7 +61,7 @@ class ContextStore:
                 if isinstance(groups, dict):
                     with self._mem_lock:
                         self._groups = {
-                            str(group_id): list(messages)
+                            str(group_id): self._parse_history(messages)
                             for group_id, messages in groups.items()
                             if isinstance(messages, list)
                         }
@@ -45,26 +69,55 @@ class ContextStore:
                 with self._mem_lock:
                     self._groups = {}
 
+    def _parse_history(self, messages: list[Any]) -> _GroupHistory:
+        history = self._new_history(None)
+        for m in messages:
+            if not isinstance(m, dict):
+                continue
+            role, content = m.get("role"), m.get("content")
+            if not isinstance(role, str) or not isinstance(content, str):
+                continue
+            if role == "system":
+                if history.system is None:
+                    history.system = content
+                continue
+            history.messages.append(_Message(sys.intern(role), content))
+        return history
+
+    def _new_history(self, system: str | None) -> _GroupHistory:
+        return _GroupHistory(system, self.max_turns * 2 or None)
+
+    def close(self) -> None:
+        with self._mem_lock:
+            self._save()
+            self._closed = True
+
     def _save(self) -> None:
+        if self._closed:
+            return
         temp_path = self.storage_path + ".tmp"
-        data = {"groups": self._groups}
+        data = {
+            "groups": {
+                group_id: history.to_list()
+                for group_id, history in self._groups.items()
+            }
+        }
         with self._lock:
             with open(temp_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
             os.replace(temp_path, self.storage_path)
 
-    def _ensure_system(self, group_id: str, system_prompt: str | None = None) -> None:
-        messages = self._groups.get(group_id, [])
-        prompt = system_prompt or self.default_system_prompt
-        system_messages = [m for m in messages if m.get("role") == "system"]
-        non_system = [m for m in messages if m.get("role") != "system"]
-        if system_messages:
-            messages = [system_messages[0]] + non_system
-        elif prompt:
-            messages = [{"role": "system", "content": prompt}] + non_system
-        else:
-            messages = non_system
-        self._groups[group_id] = messages
+    def _ensure_system(self, group_id: str, system_prompt: str | None = None) -> _GroupHistory:
+        history = self._groups.get(group_id)
+        if history is None:
+            history = self._groups[group_id] = self._new_history(None)
+        # An explicit prompt always wins so hot-reloaded group prompts apply to
+        # existing histories; the stored one only fills in when none is given.
+        if system_prompt:
+            history.system = system_prompt
+        elif history.system is None:
+            history.system = self.default_system_prompt or None
+        return history
 
     def get_messages(
         self,
@@ -73,13 +126,12 @@ class ContextStore:
     ) -> list[dict[str, str]]:
         group_key = str(group_id)
         with self._mem_lock:
-            self._ensure_system(group_key, system_prompt)
-            return list(self._groups.get(group_key, []))
+            return self._ensure_system(group_key, system_prompt).to_list()
 
     def reset(self, group_id: int, system_prompt: str | None = None) -> None:
         group_key = str(group_id)
         with self._mem_lock:
-            self._groups[group_key] = []
+            self._groups[group_key] = self._new_history(None)
             self._ensure_system(group_key, system_prompt)
             self._save()
 
@@ -92,23 +144,13 @@ class ContextStore:
     ) -> None:
         group_key = str(group_id)
         with self._mem_lock:
-            self._ensure_system(group_key, system_prompt)
-            messages = self._groups.get(group_key, [])
+            history = self._ensure_system(group_key, system_prompt)
             user_content = clamp_message(user_text)
             assistant_content = clamp_message(assistant_text)
+            # The deque's maxlen drops the oldest messages, keeping the window
+            # at max_turns * 2 without rebuilding the list.
             if user_content:
-                messages.append({"role": "user", "content": user_content})
+                history.messages.append(_Message("user", user_content))
             if assistant_content:
-                messages.append({"role": "assistant", "content": assistant_content})
-            self._groups[group_key] = self._trim(messages)
+                history.messages.append(_Message("assistant", assistant_content))
             self._save()
-
-    def _trim(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        system_messages = [m for m in messages if m.get("role") == "system"]
-        non_system = [m for m in messages if m.get("role") != "system"]
-        max_messages = self.max_turns * 2
-        if len(non_system) > max_messages:
-            non_system = non_system[-max_messages:]
-        if system_messages:
-            return [system_messages[0]] + non_system
-        return non_system
@@ -0,0 +1,65 @@
+import time
+from dataclasses import dataclass
+
+
+MIN_ATTEMPT_SECONDS = 1.0
+# An LLM generation cannot finish in a second or two, so provider clients do
+# not start (or retry) an attempt with less than this left.
+MIN_CHAT_ATTEMPT_SECONDS = 10.0
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+Timeout = tuple[float, float]
+
+
+@dataclass
+class Deadline:
+    expires_at: float
+    exhausted: bool = False
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def overrun(self) -> bool:
+        return self.exhausted or self.expired()
+
+    def reserve(self, seconds: float) -> "Deadline":
+        return Deadline(self.expires_at - seconds)
+
+
+def attempt_timeout(
+    deadline: Deadline | None,
+    cap: float,
+    minimum: float = MIN_ATTEMPT_SECONDS,
+) -> Timeout | None:
+    # requests applies a single timeout to the connect phase and again to each
+    # socket read, so return a (connect, read) pair. The read keeps the full cap
+    # and only gives up the connect share once the budget is tighter than that.
+    # It still bounds each read rather than the whole body; for these small
+    # non-streamed responses the wait for the first byte dominates.
+    if deadline is None:
+        return CONNECT_TIMEOUT_SECONDS, cap
+    remaining = deadline.remaining()
+    if remaining < minimum:
+        deadline.exhausted = True
+        return None
+    connect = min(CONNECT_TIMEOUT_SECONDS, remaining / 2)
+    return connect, min(cap, remaining - connect)
+
+
+def can_wait(
+    deadline: Deadline | None,
+    seconds: float,
+    minimum: float = MIN_ATTEMPT_SECONDS,
+) -> bool:
+    # Skipping a retry is an ordinary provider failure, not an overrun, so
+    # this does not mark the deadline exhausted.
+    if deadline is None:
+        return True
+    return deadline.remaining() >= seconds + minimum
@@ -4,14 +4,32 @@ from typing import Any
 
 import requests
 
+from .deadline import (
+    MIN_CHAT_ATTEMPT_SECONDS,
+    Deadline,
+    attempt_timeout,
+    can_wait,
+)
+from .http_pool import ConnectionPool
+
+REQUEST_TIMEOUT = 30
+
 
 class DeepSeekClient:
     def __init__(self, api_key: str, base_url: str, model: str) -> None:
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.model = model
+        self.pool = ConnectionPool()
+
+    def close(self) -> None:
+        self.pool.close()
 
-    def chat(self, messages: list[dict[str, Any]]) -> tuple[bool, str]:
+    def chat(
+        self,
+        messages: list[dict[str, Any]],
+        deadline: Deadline | None = None,
+    ) -> tuple[bool, str]:
         url = f"{self.base_url}/v1/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -24,11 +42,21 @@ class DeepSeekClient:
         }
 
         for attempt in range(3):
+            timeout = attempt_timeout(
+                deadline, REQUEST_TIMEOUT, MIN_CHAT_ATTEMPT_SECONDS
+            )
+            if timeout is None:
+                logging.warning("DeepSeek API request skipped: deadline exceeded")
+                return False, "模型请求超时。"
             try:
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
+                response = self.pool.post(url, headers=headers, json=payload, timeout=timeout)
                 if response.status_code != 200:
                     logging.warning("DeepSeek API error: %s", response.status_code)
-                    if response.status_code in {429, 500, 502, 503, 504} and attempt < 2:
+                    if (
+                        response.status_code in {429, 500, 502, 503, 504}
+                        and attempt < 2
+                        and can_wait(deadline, 2**attempt, MIN_CHAT_ATTEMPT_SECONDS)
+                    ):
                         time.sleep(2**attempt)
                         continue
                     return False, "服务暂时不可用，请稍后再试。"
@@ -44,9 +72,13 @@ class DeepSeekClient:
                 return True, content.strip()
             except requests.RequestException:
                 logging.exception("DeepSeek API request failed")
-                if attempt < 2:
+                if attempt < 2 and can_wait(
+                    deadline, 2**attempt, MIN_CHAT_ATTEMPT_SECONDS
+                ):
                     time.sleep(2**attempt)
                     continue
+                if deadline and deadline.overrun():
+                    return False, "模型请求超时。"
                 return False, "网络异常，稍后再试。"
             except ValueError:
                 logging.exception("DeepSeek API response parse failed")
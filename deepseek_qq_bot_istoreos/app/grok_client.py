@@ -3,14 +3,27 @@ from typing import Any
 
 import requests
 
+from .deadline import MIN_CHAT_ATTEMPT_SECONDS, Deadline, attempt_timeout
+from .http_pool import ConnectionPool
+
+REQUEST_TIMEOUT = 30
+
 
 class GrokClient:
     def __init__(self, api_key: str, base_url: str, model: str) -> None:
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
         self.model = model
+        self.pool = ConnectionPool()
 
-    def chat(self, messages: list[dict[str, Any]]) -> tuple[bool, str]:
+    def close(self) -> None:
+        self.pool.close()
+
+    def chat(
+        self,
+        messages: list[dict[str, Any]],
+        deadline: Deadline | None = None,
+    ) -> tuple[bool, str]:
         url = f"{self.base_url}/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -21,8 +34,14 @@ class GrokClient:
             "messages": messages,
             "temperature": 0.7,
         }
+        timeout = attempt_timeout(
+            deadline, REQUEST_TIMEOUT, MIN_CHAT_ATTEMPT_SECONDS
+        )
+        if timeout is None:
+            logging.warning("Grok API request skipped: deadline exceeded")
+            return False, "模型请求超时。"
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = self.pool.post(url, headers=headers, json=payload, timeout=timeout)
             if response.status_code != 200:
                 logging.warning(
                     "Grok API error: %s %s",
@@ -1,18 +1,31 @@
 import json
 import logging
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass
+from threading import Event, Lock, Thread
+from types import MappingProxyType
 from typing import Any
 
 
 DEFAULT_SYSTEM_PROMPT = "你是群聊助手，回答简洁，避免刷屏。"
 
+GroupSnapshot = Mapping[str, Mapping[str, Any]]
+
 
 @dataclass
 class GroupConfigManager:
     default_prompt: str = DEFAULT_SYSTEM_PROMPT
     default_provider: str = "deepseek"
-    _groups: dict[str, dict[str, Any]] | None = None
+    allowed_providers: set[str] | None = None
+    _groups: GroupSnapshot | None = None
+
+    def __post_init__(self) -> None:
+        self._path: str | None = None
+        self._file_stat: tuple[int, int] | None = None
+        self._reload_lock = Lock()
+        self._stop_event = Event()
+        self._watcher: Thread | None = None
 
     def load(self, path: str | None = None, json_text: str | None = None) -> None:
         data: dict[str, Any] = {}
@@ -26,20 +39,98 @@ class GroupConfigManager:
             except json.JSONDecodeError:
                 logging.warning("Invalid GROUP_CONFIG_JSON")
         elif path:
+            self._path = path
+            self._file_stat = self._stat_file(path)
             if os.path.exists(path):
-                try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        payload = json.load(f)
-                    if isinstance(payload, dict):
-                        data = payload
-                    else:
-                        logging.warning("GROUP_CONFIG_PATH must point to a JSON object")
-                except (OSError, json.JSONDecodeError):
-                    logging.warning("Failed to read group config file")
+                data = self._read_file(path) or {}
             else:
                 logging.info("Group config path not found: %s", path)
 
-        self._groups = self._normalize(data)
+        self._groups = self._freeze(self._normalize(data))
+
+    def reload(self) -> bool:
+        if not self._path:
+            logging.info("Group config reload skipped: no GROUP_CONFIG_PATH")
+            return False
+        with self._reload_lock:
+            self._file_stat = self._stat_file(self._path)
+            data = self._read_file(self._path)
+            if data is None:
+                logging.warning("Group config reload failed, keeping previous config")
+                return False
+            groups = self._normalize(data)
+            error = self._validate(groups)
+            if error:
+                logging.warning("Group config rejected (%s), keeping previous config", error)
+                return False
+            self._groups = self._freeze(groups)
+        logging.info("Group config reloaded: %s groups", len(groups))
+        return True
+
+    def start_watching(self, interval: float) -> None:
+        if not self._path or interval <= 0 or self._watcher:
+            return
+        self._stop_event.clear()
+        self._watcher = Thread(
+            target=self._watch,
+            args=(interval,),
+            name="group-config-watcher",
+            daemon=True,
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop_event.set()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            if self._path and self._stat_file(self._path) != self._file_stat:
+                try:
+                    self.reload()
+                except Exception:
+                    logging.exception("Group config reload crashed")
+
+    @staticmethod
+    def _stat_file(path: str) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _read_file(path: str) -> dict[str, Any] | None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            logging.warning("Failed to read group config file")
+            return None
+        if not isinstance(payload, dict):
+            logging.warning("GROUP_CONFIG_PATH must point to a JSON object")
+            return None
+        return payload
+
+    def _validate(self, groups: dict[str, dict[str, Any]]) -> str | None:
+        if self.allowed_providers is None:
+            return None
+        unknown = {
+            entry["provider"]
+            for entry in groups.values()
+            if entry.get("provider")
+        } - self.allowed_providers
+        if unknown:
+            return f"unknown providers: {', '.join(sorted(unknown))}"
+        return None
+
+    @staticmethod
+    def _freeze(groups: dict[str, dict[str, Any]]) -> GroupSnapshot:
+        return MappingProxyType(
+            {group_id: MappingProxyType(entry) for group_id, entry in groups.items()}
+        )
 
     def _normalize(self, data: dict[str, Any]) -> dict[str, dict[str, Any]]:
         groups: dict[str, dict[str, Any]] = {}
@@ -48,11 +139,14 @@ class GroupConfigManager:
                 continue
             prompt = raw.get("prompt")
             provider = raw.get("provider", raw.get("model"))
+            cache = raw.get("cache")
             entry: dict[str, Any] = {}
             if isinstance(prompt, str) and prompt.strip():
                 entry["prompt"] = prompt.strip()
             if isinstance(provider, str) and provider.strip():
                 entry["provider"] = provider.strip().lower()
+            if isinstance(cache, bool):
+                entry["cache"] = cache
             if entry:
                 groups[str(group_id)] = entry
         return groups
@@ -67,6 +161,11 @@ class GroupConfigManager:
         provider = entry.get("provider")
         return provider or self.default_provider
 
+    def is_cache_enabled(self, group_id: int, default: bool = False) -> bool:
+        entry = (self._groups or {}).get(str(group_id), {})
+        cache = entry.get("cache")
+        return default if cache is None else cache
+
     def list_providers(self) -> set[str]:
         return {
             entry["provider"]
@@ -1,11 +1,16 @@
+import logging
 import time
+from collections import Counter
 from dataclasses import dataclass
+from threading import Lock
 from typing import Any
 
 from .context_store import ContextStore
+from .deadline import Deadline
 from .group_config import GroupConfigManager
 from .llm import LLMProvider
 from .onebot_client import OneBotClient
+from .response_cache import ResponseCache
 from .utils import clamp_message, extract_text, has_at, split_reply, strip_ai_prefix
 
 
@@ -16,6 +21,7 @@ class HandlerContext:
     self_id: int | None
     message: Any
     raw_message: str | None
+    deadline: Deadline
 
 
 class EventHandler:
@@ -30,6 +36,10 @@ class EventHandler:
         single_group_id: int,
         default_self_id: int | None = None,
         rate_limit_seconds: int = 10,
+        response_cache: ResponseCache | None = None,
+        cache_enabled: bool = False,
+        event_deadline_seconds: float = 60,
+        send_reserve_seconds: float = 5,
     ) -> None:
         self.store = store
         self.providers = providers
@@ -40,7 +50,13 @@ class EventHandler:
         self.single_group_id = single_group_id
         self.default_self_id = default_self_id
         self.rate_limit_seconds = rate_limit_seconds
+        self.response_cache = response_cache
+        self.cache_enabled = cache_enabled
+        self.event_deadline_seconds = event_deadline_seconds
+        self.send_reserve_seconds = send_reserve_seconds
         self._last_reply_time: dict[int, float] = {}
+        self._stats_lock = Lock()
+        self._deadline_overruns: Counter[str] = Counter()
 
     def handle_event(self, event: dict[str, Any]) -> None:
         if not self._is_group_message(event):
@@ -60,6 +76,7 @@ class EventHandler:
             self_id=self_id,
             message=event.get("message"),
             raw_message=event.get("raw_message"),
+            deadline=Deadline.after(self.event_deadline_seconds),
         )
 
         text = extract_text(context.message, context.raw_message)
@@ -75,63 +92,97 @@ class EventHandler:
             return
 
         if self._is_rate_limited(context.group_id):
-            self._send_reply(context.group_id, "稍等一下，10 秒后再试。")
+            self._send_reply(context, "稍等一下，10 秒后再试。")
             return
 
         prompt = self.group_config.get_prompt(context.group_id)
-        _, provider = self._get_provider(context.group_id)
+        provider_name, provider = self._get_provider(context.group_id)
         if not provider:
-            self._send_reply(context.group_id, "模型未配置，请联系管理员。")
+            self._send_reply(context, "模型未配置，请联系管理员。")
             return
 
         messages = self.store.get_messages(context.group_id, prompt)
+        cache = self._get_cache(context.group_id)
+        cache_key = None
+        if cache:
+            cache_key = cache.make_key(
+                context.group_id, provider_name, provider.model, text, messages
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.store.append_turn(context.group_id, text, cached, prompt)
+                self._send_reply(context, cached)
+                return
+
         messages.append({"role": "user", "content": text})
 
-        success, reply = provider.chat(messages)
+        chat_deadline = context.deadline.reserve(self.send_reserve_seconds)
+        success, reply = provider.chat(messages, chat_deadline)
         if not success:
-            self._send_reply(context.group_id, reply)
+            if chat_deadline.overrun():
+                self._record_overrun(context.group_id, "chat")
+            self._send_reply(context, reply)
             return
 
+        if cache and cache_key:
+            cache.put(cache_key, reply)
         self.store.append_turn(context.group_id, text, reply, prompt)
-        self._send_reply(context.group_id, reply)
+        self._send_reply(context, reply)
 
     def _handle_command(self, context: HandlerContext, text: str) -> bool:
         if text.strip() == "/ping":
-            self._send_reply(context.group_id, "pong")
+            self._send_reply(context, "pong")
             return True
         if text.strip() == "/help":
             help_text = (
                 "触发方式：@机器人 或 /ai 前缀\n"
                 "指令：/help /ping /reset /model"
             )
-            self._send_reply(context.group_id, help_text)
+            self._send_reply(context, help_text)
             return True
         if text.strip() == "/reset":
             prompt = self.group_config.get_prompt(context.group_id)
             self.store.reset(context.group_id, prompt)
-            self._send_reply(context.group_id, "已清空本群上下文。")
+            if self.response_cache:
+                self.response_cache.clear(context.group_id)
+            self._send_reply(context, "已清空本群上下文。")
             return True
         if text.strip() == "/model":
             provider_name, provider = self._get_provider(context.group_id)
             if not provider:
-                self._send_reply(context.group_id, "模型未配置，请联系管理员。")
+                self._send_reply(context, "模型未配置，请联系管理员。")
                 return True
             self._send_reply(
-                context.group_id,
+                context,
                 f"provider={provider_name}, model={provider.model}",
             )
             return True
         return False
 
-    def _send_reply(self, group_id: int, text: str) -> bool:
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {}
+        if self.response_cache:
+            stats["response_cache"] = self.response_cache.stats()
+        with self._stats_lock:
+            stats["deadline_overruns"] = dict(self._deadline_overruns)
+        return stats
+
+    def _send_reply(self, context: HandlerContext, text: str) -> bool:
         ok = True
         for chunk in split_reply(text):
-            if not self.onebot.send_group_msg(group_id, chunk):
+            if not self.onebot.send_group_msg(context.group_id, chunk, context.deadline):
                 ok = False
         if ok:
-            self._last_reply_time[group_id] = time.time()
+            self._last_reply_time[context.group_id] = time.time()
+        elif context.deadline.overrun():
+            self._record_overrun(context.group_id, "send")
         return ok
 
+    def _record_overrun(self, group_id: int, stage: str) -> None:
+        logging.warning("Deadline exceeded for group %s during %s", group_id, stage)
+        with self._stats_lock:
+            self._deadline_overruns[stage] += 1
+
     def _is_group_message(self, event: dict[str, Any]) -> bool:
         return (
             event.get("post_type") == "message"
@@ -144,6 +195,13 @@ class EventHandler:
             return False
         return (time.time() - last) < self.rate_limit_seconds
 
+    def _get_cache(self, group_id: int) -> ResponseCache | None:
+        if not self.response_cache:
+            return None
+        if not self.group_config.is_cache_enabled(group_id, self.cache_enabled):
+            return None
+        return self.response_cache
+
     def _get_provider(self, group_id: int) -> tuple[str, LLMProvider | None]:
         provider_name = self.group_config.get_model_for_group(group_id)
         provider = self.providers.get(provider_name)
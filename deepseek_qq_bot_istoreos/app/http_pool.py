@@ -0,0 +1,23 @@
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ConnectionPool:
+    def __init__(self, pool_maxsize: int = 10) -> None:
+        self._adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        # requests.Session is not documented as thread-safe, but the urllib3
+        # pool behind HTTPAdapter is. Each call builds a throwaway Session
+        # around the shared adapter, so worker threads reuse connections
+        # without sharing Session state. Thread-local sessions would not help:
+        # ThreadingHTTPServer starts a new thread for every request.
+        session = requests.Session()
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
+        return session.post(url, **kwargs)
+
+    def close(self) -> None:
+        self._adapter.close()
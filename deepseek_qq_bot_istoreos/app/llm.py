@@ -1,8 +1,17 @@
 from typing import Any, Protocol
 
+from .deadline import Deadline
+
 
 class LLMProvider(Protocol):
     model: str
 
-    def chat(self, messages: list[dict[str, Any]]) -> tuple[bool, str]:
+    def chat(
+        self,
+        messages: list[dict[str, Any]],
+        deadline: Deadline | None = None,
+    ) -> tuple[bool, str]:
+        ...
+
+    def close(self) -> None:
         ...
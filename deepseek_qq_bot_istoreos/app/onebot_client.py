@@ -1,20 +1,38 @@
 import logging
 import requests
 
+from .deadline import Deadline, attempt_timeout
+from .http_pool import ConnectionPool
+
+REQUEST_TIMEOUT = 10
+
 
 class OneBotClient:
     def __init__(self, base_url: str, access_token: str | None = None) -> None:
         self.base_url = base_url.rstrip("/")
         self.access_token = access_token
+        self.pool = ConnectionPool()
 
-    def send_group_msg(self, group_id: int, message: str) -> bool:
+    def close(self) -> None:
+        self.pool.close()
+
+    def send_group_msg(
+        self,
+        group_id: int,
+        message: str,
+        deadline: Deadline | None = None,
+    ) -> bool:
+        timeout = attempt_timeout(deadline, REQUEST_TIMEOUT)
+        if timeout is None:
+            logging.warning("OneBot send skipped: deadline exceeded")
+            return False
         url = f"{self.base_url}/send_group_msg"
         headers = {"Content-Type": "application/json"}
         if self.access_token:
             headers["Authorization"] = f"Bearer {self.access_token}"
         payload = {"group_id": group_id, "message": message}
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
+            response = self.pool.post(url, headers=headers, json=payload, timeout=timeout)
             if response.status_code != 200:
                 logging.warning("OneBot send error: %s", response.status_code)
                 return False
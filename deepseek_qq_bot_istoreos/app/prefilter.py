@@ -0,0 +1,124 @@
+import json
+import re
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_STRING_VALUE_RE = re.compile(rb'\s*:\s*"([^"]*)"')
+_NUMBER_VALUE_RE = re.compile(rb'\s*:\s*"?(\d+)')
+_COMMAND_RE = re.compile(rb"/(?:[aA][iI]|help|ping|reset|model)")
+
+STAGES = ("post_type", "message_type", "group", "trigger", "invalid_json", "passed")
+
+# Top-level scalar keys sit ahead of or behind the (possibly long) message
+# payload in the OneBot implementations seen in practice, so only the first and
+# last KEY_WINDOW bytes are searched instead of the whole body.
+KEY_WINDOW = 512
+
+
+def _field(body: bytes, key: bytes, pattern: re.Pattern[bytes]) -> bytes | None:
+    # Nested string content is JSON-escaped, so an unescaped "key" is always an
+    # object key, but nested objects may reuse it. Only trust a key that occurs
+    # exactly once in the searched windows; anything else is left to the full
+    # parse.
+    size = len(body)
+    if size <= 2 * KEY_WINDOW:
+        windows = ((0, size),)
+    else:
+        windows = ((0, KEY_WINDOW), (size - KEY_WINDOW, size))
+    found = -1
+    for start, end in windows:
+        index = body.find(key, start, end)
+        if index < 0:
+            continue
+        if found >= 0 or body.find(key, index + 1, end) >= 0:
+            return None
+        found = index
+    if found < 0:
+        return None
+    match = pattern.match(body, found + len(key))
+    return match.group(1) if match else None
+
+
+def loads_json(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body.decode("utf-8"))
+
+
+@dataclass
+class EventPrefilter:
+    single_group_id: int
+    require_at: bool
+
+    def __post_init__(self) -> None:
+        self._group_id_text = str(self.single_group_id)
+        self._group_id = self._group_id_text.encode("ascii")
+        # orjson decodes a typical event faster than the byte scans below, so
+        # with it installed events are decoded first and filtered on the dict
+        # (trigger detection is then left to EventHandler); see
+        # bench/bench_prefilter.py.
+        self.scan_raw = orjson is None
+        self._lock = Lock()
+        self._counts: dict[str, int] = dict.fromkeys(STAGES, 0)
+
+    def check(self, body: bytes) -> str | None:
+        # Only reject on a positive mismatch; anything the byte scan cannot
+        # decide is left to the full parse and EventHandler.
+        if not self.scan_raw:
+            return None
+        stage = self._reject_stage(body)
+        self.record(stage or "passed")
+        return stage
+
+    def check_decoded(self, event: Any) -> str | None:
+        if self.scan_raw or not isinstance(event, dict):
+            return None
+        stage = self._reject_event(event)
+        self.record(stage or "passed")
+        return stage
+
+    def record(self, stage: str) -> None:
+        with self._lock:
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def _reject_stage(self, body: bytes) -> str | None:
+        post_type = _field(body, b'"post_type"', _STRING_VALUE_RE)
+        if post_type is not None and post_type != b"message":
+            return "post_type"
+        message_type = _field(body, b'"message_type"', _STRING_VALUE_RE)
+        if message_type is not None and message_type != b"group":
+            return "message_type"
+        group_id = _field(body, b'"group_id"', _NUMBER_VALUE_RE)
+        if group_id is not None and group_id != self._group_id:
+            return "group"
+        if self.require_at and not self._has_trigger(body):
+            return "trigger"
+        return None
+
+    def _reject_event(self, event: dict[str, Any]) -> str | None:
+        if event.get("post_type") != "message":
+            return "post_type"
+        if event.get("message_type") != "group":
+            return "message_type"
+        if str(event.get("group_id")) != self._group_id_text:
+            return "group"
+        return None
+
+    @staticmethod
+    def _has_trigger(body: bytes) -> bool:
+        # Check both the CQ code and the array segment: raw_message is not
+        # guaranteed to mirror every segment, and EventHandler accepts either.
+        if b"[CQ:at," in body or b'"at"' in body:
+            return True
+        return b"/" in body and _COMMAND_RE.search(body) is not None
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+CacheKey = tuple[str, str, str, str, str, str]
+
+
+def normalize_question(text: str) -> str:
+    # NFKC folds full-width forms (ＡＢＣ，？) into their half-width equivalents.
+    text = unicodedata.normalize("NFKC", text or "")
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return text.casefold()
+
+
+def hash_context(messages: list[dict[str, Any]], turns: int) -> str:
+    if turns <= 0:
+        return ""
+    recent = [m for m in messages if m.get("role") != "system"][-turns * 2 :]
+    if not recent:
+        return ""
+    raw = json.dumps(recent, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ResponseCache:
+    ttl_seconds: float
+    max_entries: int
+    context_turns: int = 0
+
+    def __post_init__(self) -> None:
+        self._lock = Lock()
+        self._entries: OrderedDict[CacheKey, tuple[float, str]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def make_key(
+        self,
+        group_id: int,
+        provider_name: str,
+        model: str,
+        question: str,
+        messages: list[dict[str, Any]],
+    ) -> CacheKey:
+        # Key on the system message actually sent, not the configured prompt.
+        system_prompt = ""
+        if messages and messages[0].get("role") == "system":
+            system_prompt = str(messages[0].get("content", ""))
+        return (
+            str(group_id),
+            provider_name,
+            model,
+            system_prompt,
+            normalize_question(question),
+            hash_context(messages, self.context_turns),
+        )
+
+    def get(self, key: CacheKey) -> str | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, answer = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return answer
+
+    def put(self, key: CacheKey, answer: str) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self, group_id: int | None = None) -> None:
+        with self._lock:
+            if group_id is None:
+                self._entries.clear()
+                return
+            group_key = str(group_id)
+            for key in [k for k in self._entries if k[0] == group_key]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
@@ -1,6 +1,8 @@
 import json
 import logging
+import signal
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Condition, Thread
 from typing import Any
 
 from .config import load_config
@@ -11,11 +13,47 @@ from .group_config import GroupConfigManager
 from .handlers import EventHandler
 from .llm import LLMProvider
 from .onebot_client import OneBotClient
+from .prefilter import EventPrefilter, loads_json
+from .response_cache import ResponseCache
 from .utils import setup_logger
 
 
+class InFlightTracker:
+    def __init__(self) -> None:
+        self._cond = Condition()
+        self._accepting = True
+        self.active = 0
+        self.completed = 0
+
+    def try_enter(self) -> bool:
+        with self._cond:
+            if not self._accepting:
+                return False
+            self.active += 1
+            return True
+
+    def exit(self) -> None:
+        with self._cond:
+            self.active -= 1
+            self.completed += 1
+            self._cond.notify_all()
+
+    def stop_accepting(self) -> bool:
+        with self._cond:
+            was_accepting = self._accepting
+            self._accepting = False
+            return was_accepting
+
+    def wait_idle(self, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.active == 0, timeout)
+
+
 class RequestHandler(BaseHTTPRequestHandler):
     handler: EventHandler
+    tracker: InFlightTracker = InFlightTracker()
+    admin_token: str | None = None
+    prefilter: EventPrefilter | None = None
     max_body_bytes: int = 1024 * 1024
 
     def _send_ok(self) -> None:
@@ -24,30 +62,78 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(b"ok")
 
+    def _send_unavailable(self) -> None:
+        self.send_response(503)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(b"shutting down")
+
+    def _send_json(self, data: dict[str, Any], status: int = 200) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_GET(self) -> None:
         if self.path == "/health":
             self._send_ok()
+        elif self.path == "/metrics":
+            stats = self.handler.stats()
+            if self.prefilter:
+                stats["prefilter"] = self.prefilter.stats()
+            self._send_json(stats)
         else:
             self._send_ok()
 
     def do_POST(self) -> None:
+        if self.path == "/admin/reload":
+            self._handle_reload()
+            return
         if self.path != "/onebot/event":
             self._send_ok()
             return
+        if not self.tracker.try_enter():
+            self._send_unavailable()
+            return
+        try:
+            self._process_event()
+        finally:
+            self.tracker.exit()
+
+    def _process_event(self) -> None:
         body = self._read_body()
         if body is None:
             self._send_ok()
             return
+        if self.prefilter and self.prefilter.check(body):
+            self._send_ok()
+            return
         try:
-            payload = json.loads(body.decode("utf-8")) if body else {}
-        except json.JSONDecodeError:
+            payload = loads_json(body) if body else {}
+        except ValueError:
             logging.warning("Invalid JSON payload")
+            if self.prefilter:
+                self.prefilter.record("invalid_json")
+            self._send_ok()
+            return
+        if self.prefilter and self.prefilter.check_decoded(payload):
             self._send_ok()
             return
 
         self._handle_event(payload)
         self._send_ok()
 
+    def _handle_reload(self) -> None:
+        if self.admin_token:
+            auth = self.headers.get("Authorization", "")
+            if auth != f"Bearer {self.admin_token}":
+                self._send_json({"ok": False, "error": "unauthorized"}, status=401)
+                return
+        ok = self.handler.group_config.reload()
+        self._send_json({"ok": ok}, status=200 if ok else 409)
+
     def _handle_event(self, payload: dict[str, Any]) -> None:
         try:
             self.handler.handle_event(payload)
@@ -128,12 +214,20 @@ def run_server() -> None:
     missing = [name for name in required_providers if name not in providers]
     if missing:
         raise ValueError(f"Missing provider configuration: {', '.join(missing)}")
+    group_config.allowed_providers = set(providers)
+    group_config.start_watching(config.group_config_reload_interval)
 
     onebot = OneBotClient(
         base_url=config.onebot_base_url,
         access_token=config.onebot_access_token,
     )
 
+    response_cache = ResponseCache(
+        ttl_seconds=config.response_cache_ttl,
+        max_entries=config.response_cache_max_entries,
+        context_turns=config.response_cache_context_turns,
+    )
+
     handler = EventHandler(
         store=store,
         providers=providers,
@@ -143,13 +237,74 @@ def run_server() -> None:
         require_at=config.require_at,
         single_group_id=config.single_group_id,
         default_self_id=config.bot_self_id,
+        response_cache=response_cache,
+        cache_enabled=config.response_cache_enabled,
+        event_deadline_seconds=config.event_deadline_seconds,
     )
 
     RequestHandler.handler = handler
+    RequestHandler.admin_token = config.admin_token
+    RequestHandler.prefilter = EventPrefilter(
+        single_group_id=config.single_group_id,
+        require_at=config.require_at,
+    )
+
+    tracker = InFlightTracker()
+    RequestHandler.tracker = tracker
 
     server = ThreadingHTTPServer(("0.0.0.0", config.port), RequestHandler)
+
+    drained: list[tuple[int, int]] = []
+
+    def drain_then_stop() -> None:
+        drained.append(_drain(tracker, config.shutdown_grace_seconds))
+        server.shutdown()
+
+    def request_shutdown(signum: int, frame: Any) -> None:
+        if not tracker.stop_accepting():
+            return
+        logging.info("Received %s, shutting down", signal.Signals(signum).name)
+        # The listener stays open so new events get 503 while the drain runs;
+        # shutdown() blocks until serve_forever() returns, which runs on this thread.
+        Thread(target=drain_then_stop, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, request_shutdown)
+    signal.signal(signal.SIGINT, request_shutdown)
+
     logging.info("Server started on port %s", config.port)
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        tracker.stop_accepting()
+        completed, abandoned = (
+            drained[0] if drained else _drain(tracker, config.shutdown_grace_seconds)
+        )
+        group_config.stop_watching()
+        store.close()
+        for provider in providers.values():
+            provider.close()
+        onebot.close()
+        if abandoned:
+            logging.warning(
+                "Shutdown complete: %s in-flight events completed, %s abandoned",
+                completed,
+                abandoned,
+            )
+        else:
+            logging.info("Shutdown complete: %s in-flight events completed", completed)
+
+
+def _drain(tracker: InFlightTracker, grace_seconds: float) -> tuple[int, int]:
+    completed_before = tracker.completed
+    if tracker.active:
+        logging.info(
+            "Waiting up to %ss for %s in-flight events",
+            grace_seconds,
+            tracker.active,
+        )
+    tracker.wait_idle(grace_seconds)
+    return tracker.completed - completed_before, tracker.active
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""Compare ContextStore against the previous list-of-dicts storage.
+
+Run from the project root: python bench/bench_context_store.py
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.context_store import ContextStore  # noqa: E402
+from app.utils import clamp_message  # noqa: E402
+
+MESSAGE = "这是一条普通长度的群聊消息，大约五十个字符左右。" * 2
+
+
+class LegacyContextStore:
+    # In-memory part of the pre-compaction ContextStore: one dict per message,
+    # rebuilt by _ensure_system/_trim on every call. Persistence is omitted
+    # because the benchmark disables saving for both stores.
+
+    def __init__(self, max_turns: int, default_system_prompt: str) -> None:
+        self.max_turns = max_turns
+        self.default_system_prompt = default_system_prompt
+        self._groups: dict[str, list[dict[str, str]]] = {}
+
+    def _ensure_system(self, group_id: str, system_prompt: str | None = None) -> None:
+        messages = self._groups.get(group_id, [])
+        prompt = system_prompt or self.default_system_prompt
+        system_messages = [m for m in messages if m.get("role") == "system"]
+        non_system = [m for m in messages if m.get("role") != "system"]
+        if system_messages:
+            messages = [system_messages[0]] + non_system
+        elif prompt:
+            messages = [{"role": "system", "content": prompt}] + non_system
+        else:
+            messages = non_system
+        self._groups[group_id] = messages
+
+    def get_messages(
+        self,
+        group_id: int,
+        system_prompt: str | None = None,
+    ) -> list[dict[str, str]]:
+        group_key = str(group_id)
+        self._ensure_system(group_key, system_prompt)
+        return list(self._groups.get(group_key, []))
+
+    def append_turn(
+        self,
+        group_id: int,
+        user_text: str,
+        assistant_text: str,
+        system_prompt: str | None = None,
+    ) -> None:
+        group_key = str(group_id)
+        self._ensure_system(group_key, system_prompt)
+        messages = self._groups.get(group_key, [])
+        user_content = clamp_message(user_text)
+        assistant_content = clamp_message(assistant_text)
+        if user_content:
+            messages.append({"role": "user", "content": user_content})
+        if assistant_content:
+            messages.append({"role": "assistant", "content": assistant_content})
+        self._groups[group_key] = self._trim(messages)
+
+    def _trim(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        system_messages = [m for m in messages if m.get("role") == "system"]
+        non_system = [m for m in messages if m.get("role") != "system"]
+        max_messages = self.max_turns * 2
+        if len(non_system) > max_messages:
+            non_system = non_system[-max_messages:]
+        if system_messages:
+            return [system_messages[0]] + non_system
+        return non_system
+
+
+def make_store(kind: str, max_turns: int, directory: str) -> Any:
+    if kind == "legacy":
+        return LegacyContextStore(max_turns, "prompt")
+    store = ContextStore(os.path.join(directory, "state.json"), max_turns, "prompt")
+    store._save = lambda: None
+    return store
+
+
+def fill(store: Any, groups: int, max_turns: int) -> None:
+    for group_id in range(groups):
+        for turn in range(max_turns):
+            store.append_turn(group_id, MESSAGE + str(turn), MESSAGE + str(turn), "prompt")
+
+
+def measure_memory(kind: str, groups: int, max_turns: int, directory: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    store = make_store(kind, max_turns, directory)
+    fill(store, groups, max_turns)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return current
+
+
+def measure_calls(kind: str, groups: int, max_turns: int, directory: str, number: int) -> float:
+    store = make_store(kind, max_turns, directory)
+    fill(store, groups, max_turns)
+    state = {"i": 0}
+
+    def step() -> None:
+        group_id = state["i"] % groups
+        state["i"] += 1
+        store.get_messages(group_id, "prompt")
+        store.append_turn(group_id, MESSAGE, MESSAGE, "prompt")
+
+    best = min(timeit.repeat(step, number=number, repeat=3))
+    # Each step is one get_messages plus one append_turn.
+    return best / number / 2 * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--groups", type=int, default=200)
+    parser.add_argument("--turns", type=int, nargs="+", default=[12, 50])
+    parser.add_argument("--number", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for max_turns in args.turns:
+            legacy_mem = measure_memory("legacy", args.groups, max_turns, directory)
+            compact_mem = measure_memory("compact", args.groups, max_turns, directory)
+            legacy_us = measure_calls("legacy", args.groups, max_turns, directory, args.number)
+            compact_us = measure_calls("compact", args.groups, max_turns, directory, args.number)
+            print(
+                f"MAX_TURNS={max_turns} groups={args.groups}: "
+                f"memory {legacy_mem / 1e6:.2f} MB -> {compact_mem / 1e6:.2f} MB, "
+                f"per call {legacy_us:.2f} us -> {compact_us:.2f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Measure the event prefilter against decoding and dispatching every event.
+
+Run from the project root: python bench/bench_prefilter.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import prefilter  # noqa: E402
+from app.context_store import ContextStore  # noqa: E402
+from app.group_config import GroupConfigManager  # noqa: E402
+from app.handlers import EventHandler  # noqa: E402
+
+GROUP_ID = 123456789
+SELF_ID = 10001
+
+
+def make_event(text: str, group_id: int = GROUP_ID) -> bytes:
+    # Field order follows NapCat, which puts post_type/group_id after message.
+    event = {
+        "self_id": SELF_ID,
+        "user_id": 20002,
+        "time": 1700000000,
+        "message_id": 1,
+        "message_type": "group",
+        "sender": {"user_id": 20002, "nickname": "n", "card": "", "role": "member"},
+        "raw_message": text,
+        "font": 14,
+        "sub_type": "normal",
+        "message": [{"type": "text", "data": {"text": text}}],
+        "message_format": "array",
+        "post_type": "message",
+        "group_id": group_id,
+    }
+    return json.dumps(event, ensure_ascii=False).encode("utf-8")
+
+
+def cases() -> list[tuple[str, bytes]]:
+    chatter = "今天天气不错，大家中午吃什么？"
+    return [
+        ("heartbeat", json.dumps({
+            "time": 1700000000,
+            "self_id": SELF_ID,
+            "post_type": "meta_event",
+            "meta_event_type": "heartbeat",
+            "status": {"online": True, "good": True},
+            "interval": 30000,
+        }).encode("utf-8")),
+        ("other group", make_event(chatter, group_id=987654321)),
+        ("chatter 300B", make_event(chatter)),
+        ("chatter 2KB", make_event(chatter * 45)),
+        ("chatter 32KB", make_event(chatter * 720)),
+    ]
+
+
+def per_call_us(func: Any, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def run(decoder: str, handler: EventHandler, number: int) -> None:
+    if decoder == "json":
+        prefilter.orjson = None
+    event_filter = prefilter.EventPrefilter(single_group_id=GROUP_ID, require_at=True)
+
+    print(f"decoder={decoder}")
+    print(f"  {'event':<14}{'stage':<14}{'check':>9}{'decode+handle':>16}{'filtered':>11}")
+    for name, body in cases():
+        def check() -> str | None:
+            return event_filter.check(body) or event_filter.check_decoded(
+                prefilter.loads_json(body)
+            )
+
+        def baseline() -> None:
+            handler.handle_event(prefilter.loads_json(body))
+
+        def filtered() -> None:
+            # Same sequence as RequestHandler._process_event.
+            if event_filter.check(body):
+                return
+            payload = prefilter.loads_json(body)
+            if event_filter.check_decoded(payload):
+                return
+            handler.handle_event(payload)
+
+        stage = check() or "passed"
+        print(
+            f"  {name:<14}{stage:<14}"
+            f"{per_call_us(check, number):>7.2f}us"
+            f"{per_call_us(baseline, number):>14.2f}us"
+            f"{per_call_us(filtered, number):>9.2f}us"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    group_config = GroupConfigManager()
+    group_config.load()
+    with tempfile.TemporaryDirectory() as directory:
+        store = ContextStore(
+            storage_path=os.path.join(directory, "state.json"),
+            max_turns=12,
+            default_system_prompt=group_config.default_prompt,
+        )
+        # Every benchmarked event is dropped before a provider or OneBot call.
+        handler = EventHandler(
+            store=store,
+            providers={},
+            group_config=group_config,
+            default_provider="deepseek",
+            onebot=None,  # type: ignore[arg-type]
+            require_at=True,
+            single_group_id=GROUP_ID,
+            default_self_id=SELF_ID,
+        )
+        decoders = ["orjson", "json"] if prefilter.orjson is not None else ["json"]
+        for decoder in decoders:
+            run(decoder, handler, args.number)
+
+
+if __name__ == "__main__":
+    main()
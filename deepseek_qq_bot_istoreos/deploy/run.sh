@@ -11,4 +11,4 @@ else
   exit 1
 fi
 
-python -m app.server
+exec python -m app.server